@@ -1,14 +1,41 @@
 #!/usr/bin/env python3
 
-import os, time, datetime, argparse
+import os, sys, time, datetime, argparse
 import enum, math
 # import numpy, scipy
 import ROOT
 import builtins
 
+try :
+    import uproot
+except ImportError :
+    uproot = None
+
 from .analysis_status import AnalysisStatus as stt
 from .event_flags import EventFlags as evs
 
+_OK_EVT   = stt.OKEvent
+_SKIP     = stt.SkipEvent
+_QUIT     = stt.QuitLoop
+_OK_FUNC  = stt.OKFunc
+_ERR_FUNC = stt.ErrFunc
+
+def _next_checkpoint(entry,freq,last_entry) :
+    return builtins.min( entry - entry%freq + freq, last_entry )
+
+def _compute_eta(entry,nentries,start_ts,now_ts) :
+
+    dt = now_ts - start_ts
+    rest_time = 0
+    if dt > 0 and entry > 0 :
+        rest_time = (nentries-entry)*dt/entry
+
+    h = rest_time//3600
+    rest_time = rest_time%3600
+    m = rest_time//60
+    s = rest_time%60
+    return h, m, s
+
 class VANLModule :
     """Basic class of analysis module
 
@@ -27,9 +54,29 @@ class VANLModule :
         self.input_tree (ROOT.TTree):
         self.output_file_name (str):
         self.output_file (ROOT.TFile):
+
+    Class Attributes:
+        BATCH (bool): If True, ``user_event_routine_batch`` is called for each batch of entries
+            read by uproot instead of ``user_event_routine`` for each entry.
+            ``open_files`` is not required in this mode. (default:False)
+        branches_used (list<str>): names or wildcard patterns (e.g. 'hit*') of branches used in analysis.
+            All branches if None. (default:None)
+        batch_step_size (str or int): size of a batch in BATCH mode (default:'100 MB')
+        cache_size (int): size of TTreeCache of the input tree in bytes. Default of ROOT if None. (default:None)
+
+    Note :
+        By default, the input tree is read with the default TTreeCache of ROOT.
+        If ``branches_used`` or ``cache_size`` is set, ``open_files`` registers the used branches
+        (all branches if ``branches_used`` is None) to TTreeCache and prefetches their baskets
+        for each cluster. This is skipped in BATCH mode, where the tree is read by uproot.
     """
 
-    def __init__(self,input_file_name,args,intree,outdir='.',nentries=-1,printfreq=100,verbose=0) :
+    BATCH = False
+    branches_used = None
+    batch_step_size = '100 MB'
+    cache_size = None
+
+    def __init__(self,input_file_name,args,intree,outdir='.',nentries=-1,printfreq=100,verbose=0,threads=1) :
         """
         Args :
             input_file_name (str): a name of ROOT file to open
@@ -39,6 +86,10 @@ class VANLModule :
             nentries (int): number of entries to read in loop
             printfreq (int): frequency (number of entries) to print progress
             verbose (int): verbose level to print message
+            threads (int): number of threads used by ROOT to read and write files.
+                Implicit multi-threading of ROOT is disabled if 1, and uses all cores if 0.
+                It is enabled only during ``run_analysis``. Branches of the input tree are then
+                read by TTree::GetEntry even if ``branches_used`` is set.
 
 
         Examples : This method must be called in constructor of user-defined class like this.
@@ -72,9 +123,15 @@ class VANLModule :
         self.nentries = nentries
         self.print_frequency = printfreq
         self.verbose = verbose
+        self.threads = threads
         #
-        self.start_time = datetime.datetime.now()
-        self.prev_time = datetime.datetime.now()
+        self._branch_getentries = None
+        self._get_entry = None
+        self._load_entry = None
+        self._next_print = 0
+        self._inv_nentries_pct = 0.0
+        self.start_time = time.perf_counter()
+        self.prev_time = self.start_time
 
     def _open_root(self,file_name) :
 
@@ -98,12 +155,48 @@ class VANLModule :
 
         print( ' Load Tree :', tree_name, 'from', self.input_file_name )
 
+        # The tree is already read by TFile::Get, so GetEntries just returns the stored count
         nentries = tree.GetEntries()
         if self.nentries < 0 or nentries < self.nentries :
             self.nentries = nentries
 
         return tree
 
+    def _list_active_branches(self) :
+
+        tree = self.input_tree
+
+        if self.branches_used is not None :
+            tree.SetBranchStatus( '*', 0 )
+            for name in self.branches_used :
+                tree.SetBranchStatus( name, 1 )
+
+        friends = tree.GetListOfFriends()
+        if friends and friends.GetEntries() > 0 :
+            return None
+
+        branches = tree.GetListOfBranches()
+        active = [ b for b in branches if b.TestBit( ROOT.kDoNotProcess ) == False ]
+        if len( active ) == branches.GetEntries() :
+            return None
+
+        return [ b.GetEntry for b in active ]
+
+    def _setup_tree_cache(self) :
+
+        tree = self.input_tree
+        if self.cache_size is not None :
+            tree.SetCacheSize( self.cache_size )
+
+        if self.branches_used is None :
+            tree.AddBranchToCache( '*', True )
+        else :
+            for name in self.branches_used :
+                tree.AddBranchToCache( name, True )
+
+        tree.StopCacheLearningPhase()
+        tree.SetClusterPrefetch( True )
+
     def _create_root(self,file_name) :
 
         if self.input_file == None :
@@ -125,6 +218,9 @@ class VANLModule :
         """Method to open and create ROOT files.
 
         This method set pointers of TFile and TTree to attributes of this class.
+        If ``branches_used`` is set, the other branches of the input tree are disabled.
+        If ``branches_used`` or ``cache_size`` is set, baskets of the used branches
+        are prefetched for each cluster by TTreeCache, except in BATCH mode.
         This method is recommended to be called in ``user_before_loop``.
 
         Returns :
@@ -139,44 +235,48 @@ class VANLModule :
         if self.input_tree is None :
             return self.error_before_loop()
 
+        self._branch_getentries = self._list_active_branches()
+        if self.BATCH == False :
+            if self.branches_used is not None or self.cache_size is not None :
+                self._setup_tree_cache()
+        if self._branch_getentries is None or self.threads != 1 :
+            self._get_entry = self.input_tree.GetEntry
+        else :
+            self._load_entry = self.input_tree.LoadTree
+            self._get_entry = self._get_active_entry
+
         self.output_file = self._create_root( self.output_file_name )
         if self.output_file is None :
             return self.error_before_loop()
 
         return self.ok_before_loop()
 
+    def _set_progress_scale(self) :
+
+        self._inv_nentries_pct = 0.0
+        if self.nentries > 0 :
+            self._inv_nentries_pct = 100.0/self.nentries
+
     def _print_progress(self,current_entry) :
 
         current_entry = int(current_entry)
 
         if current_entry == 0 :
-            self.start_time = datetime.datetime.now()
-
-        if current_entry%self.print_frequency == 0 :
+            self.start_time = time.perf_counter()
 
-            now = datetime.datetime.now()
-            dt = (now-self.start_time).total_seconds()
-            rest_entries = self.nentries - current_entry
-            progress_in_dt = current_entry/dt
-            rest_time = 0
-            if progress_in_dt != 0 :
-                rest_time = rest_entries/progress_in_dt
+        if current_entry >= self._next_print :
 
-            h = rest_time//3600
-            rest_time = rest_time%3600
-            m = rest_time//60
-            rest_time = rest_time%60
-            s = rest_time
+            now = time.perf_counter()
+            h, m, s = _compute_eta( current_entry, self.nentries, self.start_time, now )
 
             self.prev_time = now
-            rest=f': Time {h:02.0f}:{m:02.0f}:{s:04.1f}'
+            percent = current_entry*self._inv_nentries_pct
 
-            print(
-                '\r', '{:9d}/{:9d}({:5.2f}%)'\
-                .format( current_entry, self.nentries,\
-                float( current_entry/self.nentries*100.0 ) ),
-                rest, end=''
-                )
+            sys.stdout.write( f'\r {current_entry:9d}/{self.nentries:9d}({percent:5.2f}%)'\
+                f' : Time {h:02.0f}:{m:02.0f}:{s:04.1f}' )
+
+            self._next_print = _next_checkpoint( current_entry,\
+                self.print_frequency, self.nentries - 1 )
 
         if current_entry == self.nentries - 1 :
             print( '' )
@@ -189,32 +289,85 @@ class VANLModule :
         Note : Analysis flow has 3 steps,
             1. call user_before_loop
             2. loop with calling user_event_routine N-times
+               (or user_event_routine_batch for each batch if BATCH is True)
             3. call user_after_loop
         """
 
-        if self.user_before_loop() != stt.OKFunc :
-            return stt.ErrFunc
+        self._next_print = 0
+
+        enable_mt = self.threads != 1 and ROOT.IsImplicitMTEnabled() == False
+        if enable_mt :
+            ROOT.EnableImplicitMT( self.threads )
+
+        status = self._run_steps()
 
-        entry_list = range( self.nentries )
-        # entries = numpy.array( [ range( self.nentries ) ] )
+        if enable_mt :
+            ROOT.DisableImplicitMT()
 
-        # numpy.apply_along_axis( self.run_loop, axis=0, arr=entries )
-        for entry in entry_list :
-            evs.clear()
-            if self._run_loop(entry) == stt.QuitLoop :
-                break
+        return status
 
-        if self.user_after_loop() != stt.OKFunc :
-            return stt.ErrFunc
+    def _run_steps(self) :
+
+        if self.user_before_loop() is not _OK_FUNC :
+            return _ERR_FUNC
+
+        evs.clear()
+
+        if self.BATCH == True :
+            if self._run_batch_loop() is _ERR_FUNC :
+                return _ERR_FUNC
+        else :
+            if self._get_entry is None :
+                self._get_entry = self.input_tree.GetEntry
+            self._set_progress_scale()
+            entry_list = range( self.nentries )
+            for entry in entry_list :
+                if self._run_loop(entry) is _QUIT :
+                    break
+
+        if self.user_after_loop() is not _OK_FUNC :
+            return _ERR_FUNC
 
         evs.output()
 
     def _run_loop(self,current_entry) :
 
-        current_entry = self._print_progress( current_entry )
-        self.input_tree.GetEntry( current_entry )
+        if current_entry >= self._next_print :
+            self._print_progress( current_entry )
+        self._get_entry( current_entry )
         return self.user_event_routine(current_entry)
 
+    def _get_active_entry(self,current_entry) :
+
+        self._load_entry( current_entry )
+        for get_entry in self._branch_getentries :
+            get_entry( current_entry )
+
+    def _run_batch_loop(self) :
+
+        if uproot is None :
+            self._print_error( 'run_analysis', 'uproot is required in BATCH mode' )
+            return _ERR_FUNC
+
+        with uproot.open( self.input_file_name ) as file :
+
+            tree = file[ self.input_tree_name ]
+            nentries = int( tree.num_entries )
+            if self.nentries < 0 or nentries < self.nentries :
+                self.nentries = nentries
+            self._set_progress_scale()
+
+            batches = tree.iterate( filter_name=self.branches_used, entry_stop=self.nentries,\
+                step_size=self.batch_step_size, library='np', report=True )
+
+            for batch, report in batches :
+                first_entry = self._print_progress( report.tree_entry_start )
+                if self.user_event_routine_batch(batch,first_entry) is _QUIT :
+                    return _QUIT
+
+        self._print_progress( self.nentries-1 )
+        return _OK_FUNC
+
     def _print_error(self,where,message=None) :
         if message is None :
             print( f'*** Error in {where} ***' )
@@ -227,7 +380,7 @@ class VANLModule :
             Call in ``user_event_routine`` method
         """
         evs.accumulate()
-        return stt.OKEvent
+        return _OK_EVT
 
     def skip_event(self) :
         """
@@ -235,7 +388,7 @@ class VANLModule :
             Call in ``user_event_routine`` method
         """
         evs.accumulate()
-        return stt.SkipEvent
+        return _SKIP
 
     def quit_loop(self) :
         """
@@ -244,35 +397,35 @@ class VANLModule :
         """
         evs.accumulate()
         self._print_progress( self.nentries-1 )
-        return stt.QuitLoop
+        return _QUIT
 
     def ok_before_loop(self) :
         """
         Note :
             Call in ``user_before_loop`` method
         """
-        return stt.OKFunc
+        return _OK_FUNC
 
     def error_before_loop(self) :
         """
         Note :
             Call in ``user_before_loop`` method
         """
-        return stt.ErrFunc
+        return _ERR_FUNC
 
     def ok_after_loop(self) :
         """
         Note :
             Call in ``user_after_loop`` method
         """
-        return stt.OKFunc
+        return _OK_FUNC
 
     def error_after_loop(self) :
         """
         Note :
             Call in ``user_after_loop`` method
         """
-        return stt.ErrFunc
+        return _ERR_FUNC
 
     def user_output_basename(self,file_name) :
         """Method to determine name of output file using that of input file.
@@ -312,6 +465,29 @@ class VANLModule :
 
         return self.ok_event()
 
+    def user_event_routine_batch(self,batch,first_entry) :
+        """Method called each batch of entries in loop when BATCH is True.
+
+        Note :
+            Branches are read by uproot, not by the input tree.
+            Only branches in ``branches_used`` are read if it is not None.
+
+        Args :
+            batch (dict<str,numpy.ndarray>): arrays of branches keyed by branch name
+            first_entry (int): ID of the first entry in this batch
+
+        Returns :
+            AnalysisStatus:
+
+            Return by using methods of this class for each cases
+
+                1. To end this batch normally, return self.ok_event()
+                2. To end this batch and go to the next, return self.skip_event()
+                3. To end this batch and exit from the loop, return self.quit_loop()
+        """
+
+        return self.ok_event()
+
     def user_before_loop(self) :
         """Method called once before loop. Histograms are defined here.
 
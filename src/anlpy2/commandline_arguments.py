@@ -49,10 +49,11 @@ class ArrayAction(argparse.Action) :
 
         self.min = min
         self.max = max
+        self.sort = sort
 
         type_func = lambda x : list( map( type, x.split(',') ) )
         if sort == True :
-            type_func = lambda x : sorted( list( map( type, x.split(',') ) ) )
+            type_func = lambda x : sorted( map( type, x.split(',') ) )
         super(ArrayAction, self).__init__(option_strings, dest, nargs=1, default=default, type=type_func, help=help, metavar=metavar, **kwargs)
 
         # print(self.format_usage())
@@ -67,9 +68,14 @@ class ArrayAction(argparse.Action) :
         if self.array_size != None and len(values) != self.array_size :
             parser.error( f'Invalid number of arguments ({values}) for {self.dest} ({self.array_size} is required)' )
 
-        if self.min != None and builtins.min(values) < self.min :
+        if self.sort == True :
+            values_min, values_max = values[0], values[-1]
+        else :
+            values_min, values_max = builtins.min(values), builtins.max(values)
+
+        if self.min != None and values_min < self.min :
             raise ValueError( f'Invalid arguments : attemp to set value below `min`' )
-        if self.max != None and self.max < builtins.max(values) :
+        if self.max != None and self.max < values_max :
             raise ValueError( f'Invalid arguments : attemp to set value over `max`' )
 
         setattr(namespace, self.dest, values )
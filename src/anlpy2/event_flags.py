@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
 
+import numpy
+
 # from analysis_framework import analysis_status as stt
 from .analysis_status import AnalysisStatus as stt
 
+_INDEX  = {}
+_KEYS   = []
+_COUNTS = numpy.zeros( 0 )
+_ACCUMS = numpy.zeros( 0 )
+_ISSET  = numpy.zeros( 0, dtype=bool )
+
 class EventFlags :
     """Class to set various flags for each event.
 
@@ -37,7 +45,7 @@ class EventFlags :
                      0 :  other_selction
     """
 
-    __dict_of_flags = {}
+    __when_index = {}
     __verbose_level = 1
     __status        = stt.OKEvent
 
@@ -47,7 +55,7 @@ class EventFlags :
         Returns :
             int: Number of defined flags
         """
-        return len( EventFlags.__dict_of_flags )
+        return len( _KEYS )
 
     @classmethod
     def status(cls) :
@@ -55,10 +63,10 @@ class EventFlags :
         Returns :
             AnalysisStatus: Status of EventFlags
         """
-        return __status
+        return EventFlags.__status
 
-    @classmethod
-    def has(cls,key) :
+    @staticmethod
+    def has(key) :
         """
         Args :
             key (str): name of a flag
@@ -66,33 +74,7 @@ class EventFlags :
         Returns :
             bool: True if flag is defined, False otherwise.
         """
-        if key in EventFlags.__dict_of_flags :
-            return True
-        return False
-
-    @classmethod
-    def __newkey(cls,key) :
-
-        iter = 2
-        while True :
-            candidate = key+'-{:d}'.format( iter )
-            if EventFlags.has( candidate ) == False :
-                break
-            iter += 1
-
-        return candidate
-
-    def __init__(self,key) :
-
-        if EventFlags.has( key ) :
-            self.__key = EventFlags.__newkey( key )
-        else :
-            self.__key = key
-
-        self.__count = 0.0
-        self.__isset = False
-        self.__accum = 0.0
-        # EventFlags.__dict_of_flags[ self.__key ] = self
+        return key in _INDEX
 
     @classmethod
     def define(cls,key) :
@@ -101,13 +83,19 @@ class EventFlags :
             key (str): name of a flag
         """
 
-        if EventFlags.has( key ) == True :
+        global _COUNTS, _ACCUMS, _ISSET
+
+        if key in _INDEX :
             return
-        temp = EventFlags( key )
-        EventFlags.__dict_of_flags[ temp.__key ] = temp
 
-    @classmethod
-    def set(cls,key,val=1.0) :
+        _INDEX[ key ] = len( _KEYS )
+        _KEYS.append( key )
+        _COUNTS = numpy.append( _COUNTS, 0.0 )
+        _ACCUMS = numpy.append( _ACCUMS, 0.0 )
+        _ISSET  = numpy.append( _ISSET, False )
+
+    @staticmethod
+    def set(key,val=1.0) :
         """Method to set a flag
 
         Args :
@@ -117,14 +105,15 @@ class EventFlags :
         Note :
             If the flag is already set in the event, the value is overwritten.
         """
-        if EventFlags.has( key ) == False :
+        i = _INDEX.get( key )
+        if i is None :
             # EventFlags.define( key )
             return False
-        EventFlags.__dict_of_flags[ key ].__count = val
-        EventFlags.__dict_of_flags[ key ].__isset = True
+        _COUNTS[ i ] = val
+        _ISSET[ i ] = True
 
-    @classmethod
-    def add(cls,key,val=1.0) :
+    @staticmethod
+    def add(key,val=1.0) :
         """Method to add a value to flag
 
         Args :
@@ -134,13 +123,14 @@ class EventFlags :
         Note :
             If the flag is already set in the event, the sum of current and new value is set.
         """
-        if EventFlags.has( key ) == False :
+        i = _INDEX.get( key )
+        if i is None :
             return False
-        EventFlags.__dict_of_flags[ key ].__count += val
-        EventFlags.__dict_of_flags[ key ].__isset = True
+        _COUNTS[ i ] += val
+        _ISSET[ i ] = True
 
-    @classmethod
-    def is_set(cls,key) :
+    @staticmethod
+    def is_set(key) :
         """Method returns which the flag is set
 
         Args :
@@ -149,9 +139,10 @@ class EventFlags :
         Returns :
             True if set in this event, False otherwise.
         """
-        if EventFlags.has( key ) == False :
+        i = _INDEX.get( key )
+        if i is None :
             return False
-        return EventFlags.__dict_of_flags[ key ].__isset
+        return bool( _ISSET[ i ] )
 
     @classmethod
     def any(cls,list_of_keys) :
@@ -169,8 +160,8 @@ class EventFlags :
         """
         return all( EventFlags.is_set( key ) for key in list_of_keys )
 
-    @classmethod
-    def get(cls,key) :
+    @staticmethod
+    def get(key) :
         """
         Args :
             key (str): name of a flag
@@ -178,9 +169,10 @@ class EventFlags :
         Returns :
             float: Current value set at this event in a flag
         """
-        if EventFlags.has( key ) == False :
+        i = _INDEX.get( key )
+        if i is None :
             return None
-        return EventFlags.__dict_of_flags[ key ].__count
+        return float( _COUNTS[ i ] )
 
     @classmethod
     def integral(cls,key) :
@@ -193,7 +185,7 @@ class EventFlags :
         """
         if EventFlags.has( key ) == False :
             return None
-        return EventFlags.__dict_of_flags[ key ].__accum
+        return float( _ACCUMS[ _INDEX[ key ] ] )
 
     @classmethod
     def when(cls,condition=False,set_flag=None,otherwise_set_flag=None) :
@@ -219,48 +211,64 @@ class EventFlags :
             bool: Returns ``condition``
         """
 
-        if set_flag != None and EventFlags.has( set_flag ) == False :
-            EventFlags.define( set_flag )
-        if otherwise_set_flag != None and EventFlags.has( otherwise_set_flag ) == False :
-            EventFlags.define( otherwise_set_flag )
+        index = EventFlags.__when_index.get( ( set_flag, otherwise_set_flag ) )
+        if index is None :
+            index = EventFlags.__define_when( set_flag, otherwise_set_flag )
 
         if condition == True :
-            EventFlags.set( set_flag )
+            i = index[0]
         else :
-            EventFlags.set( otherwise_set_flag )
+            i = index[1]
+
+        if i is not None :
+            _COUNTS[ i ] = 1.0
+            _ISSET[ i ] = True
 
         return condition
 
+    @classmethod
+    def __define_when(cls,set_flag,otherwise_set_flag) :
+
+        index = []
+        for key in ( set_flag, otherwise_set_flag ) :
+            if key is None :
+                index.append( None )
+                continue
+            EventFlags.define( key )
+            index.append( _INDEX[ key ] )
+
+        index = tuple( index )
+        EventFlags.__when_index[ ( set_flag, otherwise_set_flag ) ] = index
+        return index
+
     @classmethod
     def accumulate(cls) :
-        """
+        """Add values of this event to integrals and clear values for all flags
+
         Note :
-            Automatically called at the end of analysis
+            Automatically called at the end of each event
         """
-        for flag in EventFlags.__dict_of_flags.values() :
-            flag.__accum += flag.__count
-            flag.__count = 0.0
-            flag.__isset = False
+        numpy.add( _ACCUMS, _COUNTS, out=_ACCUMS )
+        _COUNTS.fill( 0.0 )
+        _ISSET.fill( False )
 
     @classmethod
     def clear(cls) :
         """Clear values for all flags
 
         Note :
-            Automatically called at the beginning of each event
+            Automatically called before loop. Values are also cleared by `accumulate`.
         """
-        for flag in EventFlags.__dict_of_flags.values() :
-            flag.__count = 0.0
-            flag.__isset = False
+        _COUNTS[:] = 0.0
+        _ISSET[:] = False
 
     @classmethod
     def reset(cls) :
         """Reset values and integrals for all flags
         """
-        for flag in EventFlags.__dict_of_flags.values() :
-            flag.__accum = 0.0
-            flag.__count = 0.0
-            flag.__isset = False
+        _ACCUMS[:] = 0.0
+        _COUNTS[:] = 0.0
+        _ISSET[:] = False
 
     @classmethod
     def output(cls) :
@@ -268,8 +276,8 @@ class EventFlags :
         """
         print( '\n *** results of Event selection *** < Number of selects : ',\
             '{:4d}'.format( EventFlags.ndef() ), '>' )
-        for flag in EventFlags.__dict_of_flags.values() :
-            print( f'{flag.__accum:10.0f} : ', flag.__key )
+        for key, accum in zip( _KEYS, _ACCUMS ) :
+            print( f'{accum:10.0f} : ', key )
         print( '' )
 
 if __name__ == '__main__':
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+import os, time, datetime, argparse
+
+import numpy
+from ROOT import gROOT, TH1D
+
+from anlpy2.analysis_status import AnalysisStatus as stt
+from anlpy2.event_flags import EventFlags as evs
+from anlpy2.analysis_framework import VANLModule
+from anlpy2.commandline_arguments import ArrayAction as anl_action, ArgumentRangeDefaultsHelpFormatter as anl_formatter
+
+def usage() :
+
+    parser = argparse.ArgumentParser(\
+        description='Test program of ANLpy2 in BATCH mode',\
+        formatter_class=anl_formatter,\
+        add_help=False,\
+        usage='%(prog)s [options] FILE ...' )
+
+    parser.add_argument( 'file', metavar='FILE', type=str, nargs='+', help='file name' )
+
+    parser.add_argument( '--ewindow', metavar='E1,E2', action=anl_action,\
+        nargs=2, default=[0,500], help='energy window [keV]', type=float, sort=True, min=0, max=1000 )
+
+    parser.add_argument( '--nentries', metavar='N', type=int, default=-1, help='maximum number of entries to read' )
+    parser.add_argument( '--intree', metavar='TREE', type=str, default='g4tree',\
+        help='name of input tree' )
+    parser.add_argument( '--outdir', metavar='DIRE', type=str, default='.',\
+        help='directory name to output' )
+    parser.add_argument( '--printfreq', metavar='FREQ', type=int, default=10,\
+        help='\nfrequency to print progress' )
+    parser.add_argument( '-v', '--verbose', action='count', default=0,\
+        help='message verbose level' )
+
+    parser.add_argument( '-h', '--help', action='help',\
+        help='show this help message and exit' )
+
+    return parser
+
+class user_analysis_batch(VANLModule) :
+    """
+    test_anlpy2.py と同じ解析を BATCH モードで行う例
+
+    BATCH = True の場合、user_event_routine の代わりに user_event_routine_batch が
+    uproot で読み込んだエントリーのまとまり(batch)ごとに呼ばれる
+    branches_used で読み込むブランチを指定する(ワイルドカード可)
+    """
+
+    BATCH = True
+    branches_used = [ 'nhits', 'etotal' ]
+
+    def __init__(self,input_file_name,args):
+
+        super().__init__( input_file_name, args,\
+            intree=args.intree, outdir=args.outdir, nentries=args.nentries,\
+            printfreq=args.printfreq, verbose=args.verbose )
+
+    def user_output_basename(self,file_name) :
+
+        base = os.path.basename( file_name )
+        name, ext = os.path.splitext( base )
+        return name+'_spect_batch'
+
+    def user_event_routine_batch(self,batch,first_entry) :
+        """
+        エントリーのまとまりごとに呼ばれる関数
+        batch はブランチ名をキーとする numpy.ndarray の辞書
+
+        イベントごとのフラグの代わりに、evs.add でまとまり内のイベント数を計上する
+
+        Args :
+            batch (dict<str,numpy.ndarray>): ブランチごとの配列
+            first_entry (int): このまとまりの最初のエントリー番号
+
+        Returns :
+            AnalysisStatus:
+        """
+
+        nhits = batch['nhits']
+        etotal = batch['etotal'].astype( numpy.float64 )
+
+        evs.define( 'No_Hit_Event' )
+        evs.define( 'Hit_Exist_Event' )
+        evs.define( 'In_Energy_Range' )
+
+        hit_exist = nhits != 0
+        evs.add( 'No_Hit_Event', numpy.count_nonzero( ~hit_exist ) )
+        evs.add( 'Hit_Exist_Event', numpy.count_nonzero( hit_exist ) )
+
+        in_range = hit_exist & ( self.args.ewindow[0] <= etotal ) & ( etotal <= self.args.ewindow[1] )
+        evs.add( 'In_Energy_Range', numpy.count_nonzero( in_range ) )
+
+        selected = etotal[ in_range ]
+        if len( selected ) > 0 :
+            self.spect.FillN( len( selected ), selected, numpy.ones( len( selected ) ) )
+
+        return self.ok_event()
+
+    def user_before_loop(self) :
+
+        if self.open_files() is self.error_before_loop() :
+            return self.error_before_loop()
+
+        self.spect = TH1D( 'spect', 'etotal;keV', 200, -0.5, 199.5 )
+
+        return self.ok_before_loop()
+
+    def user_after_loop(self) :
+
+        self.output_file.cd()
+        self.spect.Write()
+        self.output_file.Close()
+
+        return self.ok_after_loop()
+
+if __name__ == '__main__':
+
+    parser = usage()
+    args = parser.parse_args()
+
+    if hasattr( args, 'outdir' ) :
+        os.makedirs( args.outdir, exist_ok=True )
+    gROOT.SetBatch( True )
+    gROOT.ProcessLine( 'gErrorIgnoreLevel = kFatal;' )
+
+    for file in args.file:
+
+        start = time.time()
+
+        ana = user_analysis_batch( file, args )
+        ana.run_analysis()
+
+        end = time.time()
+        print( f' Processed Time : {end-start:.3f} [sec]' )